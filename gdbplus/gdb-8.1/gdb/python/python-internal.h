@@ -527,6 +527,7 @@ char *gdbpy_parse_command_name (const char *name,
 PyObject *gdbpy_heap_block (PyObject *self, PyObject *args);
 PyObject *gdbpy_heap_walk (PyObject *self, PyObject *args);
 PyObject *gdbpy_big_blocks (PyObject *self, PyObject *args);
+PyObject *gdbpy_heap_size_histogram (PyObject *self, PyObject *args);
 PyObject *gdbpy_cpp_object (PyObject *self, PyObject *args);
 PyObject *gdbpy_shared_object (PyObject *self, PyObject *args);
 PyObject *gdbpy_objref (PyObject *self, PyObject *args);
@@ -429,3 +429,96 @@ PyObject *gdbpy_big_blocks (PyObject *self, PyObject *args)
 
 	return result;
 }
+
+static int
+compare_block_size (const void *lhs, const void *rhs)
+{
+	size_t lsize = *(const size_t *) lhs;
+	size_t rsize = *(const size_t *) rhs;
+
+	if (lsize < rsize)
+		return -1;
+	else if (lsize > rsize)
+		return 1;
+	return 0;
+}
+
+/* Implementation of gdb.heap_size_histogram()
+ * Take no argument
+   Returns a dict of in-use block size to the number of in-use blocks of that
+   size. The histogram is built in one native pass so that the caller doesn't
+   have to walk the heap block by block with gdb.heap_walk().  */
+PyObject *gdbpy_heap_size_histogram (PyObject *self, PyObject *args)
+{
+	PyObject *result = NULL;
+	struct inuse_block *blocks;
+	unsigned long num_blocks = 0;
+	unsigned long i, run;
+	size_t *sizes;
+
+	if (!update_memory_segments_and_heaps())
+	{
+		PyErr_SetString (PyExc_MemoryError, _("Failed to read and initialize process's heap segments."));
+		return NULL;
+	}
+
+	result = PyDict_New ();
+	if (!result)
+		return NULL;
+
+	// an empty heap is not an error, build_inuse_heap_blocks returns NULL for it
+	if (!walk_inuse_blocks (NULL, &num_blocks))
+	{
+		Py_DECREF (result);
+		PyErr_SetString (PyExc_RuntimeError, _("Failed to walk in-use heap blocks."));
+		return NULL;
+	}
+	else if (num_blocks == 0)
+		return result;
+
+	blocks = build_inuse_heap_blocks (&num_blocks);
+	if (!blocks)
+	{
+		Py_DECREF (result);
+		PyErr_SetString (PyExc_RuntimeError, _("Failed to build in-use heap block list."));
+		return NULL;
+	}
+
+	// sort a copy of block sizes, then count each run of equal sizes
+	sizes = (size_t *) malloc (sizeof(size_t) * num_blocks);
+	if (!sizes)
+	{
+		free_inuse_heap_blocks (blocks, num_blocks);
+		Py_DECREF (result);
+		PyErr_SetString (PyExc_MemoryError, _("Could not allocate memory."));
+		return NULL;
+	}
+	for (i = 0; i < num_blocks; i++)
+		sizes[i] = blocks[i].size;
+	free_inuse_heap_blocks (blocks, num_blocks);
+	qsort (sizes, num_blocks, sizeof(sizes[0]), compare_block_size);
+
+	for (i = 0; i < num_blocks; i += run)
+	{
+		PyObject *size_obj, *count_obj;
+		int rc = -1;
+
+		for (run = 1; i + run < num_blocks && sizes[i + run] == sizes[i]; run++)
+			;
+		size_obj = PyLong_FromSize_t (sizes[i]);
+		count_obj = PyLong_FromUnsignedLong (run);
+		if (size_obj && count_obj)
+			rc = PyDict_SetItem (result, size_obj, count_obj);
+		Py_XDECREF (size_obj);
+		Py_XDECREF (count_obj);
+		if (rc < 0)
+		{
+			Py_CLEAR (result);
+			break;
+		}
+	}
+	// cleanup
+	free (sizes);
+
+	return result;
+}
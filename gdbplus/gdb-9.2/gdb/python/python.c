@@ -2046,6 +2046,8 @@ Set the value of the convenience variable $NAME." },
     "Return the next heap memory block." },
   {"big_block", gdbpy_big_blocks, METH_VARARGS,
     "Return biggest heap memory blocks in size." },
+  {"heap_size_histogram", gdbpy_heap_size_histogram, METH_NOARGS,
+    "Return a dict of in-use heap block size to number of blocks." },
   {"cpp_object", gdbpy_cpp_object, METH_VARARGS,
     "Return C++ objects of the type same as the input expression." },
   {"shared_object", gdbpy_shared_object, METH_VARARGS,
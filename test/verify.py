@@ -90,6 +90,37 @@ def check_heap_walk(user_blks):
 		% (inuse_count, free_count)
 	inuse_blks = []
 
+# Test heap size histogram
+def check_heap_size_histogram():
+	print "[ca_test] Checking heap size histogram ..."
+	expected = {}
+	expected_total = 0
+	blk = gdb.heap_walk(0)
+	while blk:
+		if blk.inuse:
+			expected[blk.size] = expected.get(blk.size, 0) + 1
+			expected_total = expected_total + 1
+		blk = gdb.heap_walk(blk)
+	histogram = gdb.heap_size_histogram()
+	if sorted(histogram.keys()) != sorted(expected.keys()):
+		print "[ca_test] Heap size histogram has %d size classes, expected %d" \
+			% (len(histogram), len(expected))
+		raise Exception('Test Failed')
+	for size in expected:
+		if histogram[size] != expected[size]:
+			print "[ca_test] Heap size histogram counts %d blocks of size %u, expected %d" \
+				% (histogram[size], size, expected[size])
+			raise Exception('Test Failed')
+	total = sum(histogram.values())
+	if total != expected_total:
+		print "[ca_test] Heap size histogram counts %d in-use blocks, expected %d" \
+			% (total, expected_total)
+		raise Exception('Test Failed')
+	print "[ca_test]\tHistogram has %d in-use blocks in %d size classes" \
+		% (total, len(histogram))
+	expected = {}
+	histogram = {}
+
 # Test C++ objects
 def check_cplusplus_object(class_name, object_count):
 	print "[ca_test] Checking C++ objects ..."
@@ -146,6 +177,7 @@ def run_tests():
 	big_blks = gdb.big_block(big_count)
 	check_big_blocks(big_blks, big_count, user_blks)
 	check_heap_walk(user_blks)
+	check_heap_size_histogram()
 	check_cplusplus_object("Derived", object_count)
 	check_ref()
 